@@ -0,0 +1,149 @@
+import os
+import json
+import copy
+
+DELTA_VERSION = 1
+
+
+def sorted_operators(data):
+    """Return operator records ordered by unicode key, for deterministic output"""
+    return {key: data[key] for key in sorted(data)}
+
+
+def delta_path(output_json):
+    """Change set written next to operators_1.json"""
+    return os.path.splitext(output_json)[0] + ".delta.json"
+
+
+def baseline_path(output_json):
+    """Snapshot of the last deployed operators_1.json that change sets are computed against"""
+    return os.path.splitext(output_json)[0] + ".base.json"
+
+
+def write_operators(data, path):
+    """Write operator data sorted by unicode key with one record per line, so diffs stay small"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    lines = [f"{json.dumps(key, ensure_ascii=False)}: {json.dumps(record, ensure_ascii=False)}"
+             for key, record in sorted_operators(data).items()]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("{\n" + ",\n".join(lines) + "\n}\n" if lines else "{}\n")
+
+
+def compute_changeset(old, new):
+    """Compare two operator dicts and list added, removed and changed operators"""
+    added = {key: new[key] for key in sorted(new) if key not in old}
+    removed = sorted(key for key in old if key not in new)
+
+    changed = {}
+    for key in sorted(new):
+        if key not in old or old[key] == new[key]:
+            continue
+        before, after = old[key], new[key]
+        set_fields = {field: after[field] for field in sorted(after) if before.get(field) != after[field] or field not in before}
+        unset_fields = sorted(field for field in before if field not in after)
+        changed[key] = {
+            "fields": sorted(set(set_fields) | set(unset_fields)),
+            "set": set_fields,
+            "unset": unset_fields,
+        }
+
+    return {
+        "version": DELTA_VERSION,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+
+
+def is_empty(changeset):
+    """True when a change set contains no changes"""
+    return not (changeset["added"] or changeset["removed"] or changeset["changed"])
+
+
+def summarize(changeset):
+    """One-line summary of a change set"""
+    return (f"{len(changeset['added'])} added, {len(changeset['removed'])} removed, "
+            f"{len(changeset['changed'])} changed")
+
+
+def apply_delta(base, delta):
+    """Apply a change set onto operator data, returning a new sorted dict"""
+    if delta.get("version") != DELTA_VERSION:
+        raise ValueError(f"Unsupported delta version: {delta.get('version')}")
+
+    result = copy.deepcopy(base)
+    for key in delta["removed"]:
+        result.pop(key, None)
+    for key, record in delta["added"].items():
+        result[key] = copy.deepcopy(record)
+    for key, change in delta["changed"].items():
+        if key not in result:
+            raise KeyError(f"Cannot apply change to missing operator {key}")
+        result[key].update(copy.deepcopy(change["set"]))
+        for field in change["unset"]:
+            result[key].pop(field, None)
+    return sorted_operators(result)
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(data, path, indent=None):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+
+def show_help():
+    """Show help information"""
+    print("=== Operator Delta Utility ===")
+    print("Usage:")
+    print("  python operator_delta.py diff <old> <new> <delta>    - Write the change set between two files")
+    print("  python operator_delta.py apply <delta> [json]        - Apply a delta onto operators_1.json through its store")
+    print("  python operator_delta.py baseline [json]             - Mark operators_1.json as deployed (resets the change set)")
+    print("  python operator_delta.py help                        - Show this help")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "baseline":
+        output_json = sys.argv[2] if len(sys.argv) > 2 else "data/operators_1.json"
+        data = load_json(output_json)
+        write_operators(data, baseline_path(output_json))
+        save_json(compute_changeset(data, data), delta_path(output_json), indent=2)
+        print(f"Baseline saved to {baseline_path(output_json)} ({len(data)} operators)")
+    elif len(sys.argv) < 3:
+        show_help()
+    elif sys.argv[1] == "diff" and len(sys.argv) >= 5:
+        changeset = compute_changeset(load_json(sys.argv[2]), load_json(sys.argv[3]))
+        save_json(changeset, sys.argv[4], indent=2)
+        print(f"Change set: {summarize(changeset)}")
+    elif sys.argv[1] == "apply":
+        # The store is the system of record, so deltas go through it and the JSON files are regenerated
+        from operator_store import OperatorStore
+
+        delta = load_json(sys.argv[2])
+        output_json = sys.argv[3] if len(sys.argv) > 3 else "data/operators_1.json"
+        store = OperatorStore(os.path.join(os.path.dirname(output_json), "operators.db"))
+        try:
+            # A fresh checkout or deploy target may only have the JSON file
+            store.seed_from_json(output_json)
+            if os.path.exists(output_json) and store.all() != load_json(output_json):
+                print(f"❌ {store.db_path} does not match {output_json}; export or re-import before applying a delta")
+                sys.exit(1)
+            store.apply_delta(delta)
+            store.export_json(output_json, os.path.join(os.path.dirname(output_json), "operators.json"))
+        except (KeyError, ValueError) as e:
+            print(f"❌ Cannot apply delta: {e}")
+            sys.exit(1)
+        finally:
+            store.close()
+        print(f"Applied delta: {summarize(delta)}")
+    else:
+        print(f"Unknown command: {sys.argv[1]}")
+        show_help()
@@ -0,0 +1,250 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from operator_delta import sorted_operators, apply_delta, write_operators
+
+# Fields exported to the lightweight operators.json (no palette / pixel grid)
+SUMMARY_FIELDS = ["name", "unicode", "index", "hex"]
+
+# Bits kept per RGB channel when quantizing a hex colour into a bucket
+BUCKET_BITS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operators (
+    unicode      TEXT PRIMARY KEY,
+    name         TEXT NOT NULL,
+    series       INTEGER,
+    hex          TEXT,
+    color_bucket INTEGER,
+    data         TEXT NOT NULL,
+    updated_at   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_operators_name ON operators(name);
+CREATE INDEX IF NOT EXISTS idx_operators_series ON operators(series);
+CREATE INDEX IF NOT EXISTS idx_operators_color_bucket ON operators(color_bucket);
+"""
+
+
+def hex_to_rgb(hex_color):
+    """Convert '#rrggbb' to an (r, g, b) tuple"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def color_bucket(hex_color):
+    """Quantize a hex colour into a coarse RGB bucket id"""
+    if not hex_color:
+        return None
+    shift = 8 - BUCKET_BITS
+    r, g, b = (c >> shift for c in hex_to_rgb(hex_color))
+    return (r << (2 * BUCKET_BITS)) | (g << BUCKET_BITS) | b
+
+
+class OperatorStore:
+    """SQLite-backed store for operator records, the system of record for operators_1.json"""
+
+    def __init__(self, db_path="data/operators.db"):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        """Close the underlying connection"""
+        self.conn.close()
+
+    def count(self):
+        """Return the number of stored operators"""
+        return self.conn.execute("SELECT COUNT(*) FROM operators").fetchone()[0]
+
+    def _row_values(self, record, updated_at):
+        return (
+            record["unicode"],
+            record.get("name", ""),
+            record.get("index"),
+            record.get("hex"),
+            color_bucket(record.get("hex")),
+            json.dumps(record, ensure_ascii=False),
+            updated_at,
+        )
+
+    def upsert(self, record):
+        """Insert or update a single operator record"""
+        self.upsert_many([record])
+
+    def upsert_many(self, records):
+        """Insert or update operator records in one transaction"""
+        updated_at = datetime.now().isoformat()
+        rows = [self._row_values(record, updated_at) for record in records]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO operators (unicode, name, series, hex, color_bucket, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(unicode) DO UPDATE SET
+                    name = excluded.name,
+                    series = excluded.series,
+                    hex = excluded.hex,
+                    color_bucket = excluded.color_bucket,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def delete(self, unicode_name):
+        """Remove an operator by its unicode key"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM operators WHERE unicode = ?", (unicode_name,))
+
+    def get(self, unicode_name):
+        """Return a single operator record or None"""
+        row = self.conn.execute(
+            "SELECT data FROM operators WHERE unicode = ?", (unicode_name,)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def _query(self, where="", params=()):
+        rows = self.conn.execute(
+            f"SELECT data FROM operators {where} ORDER BY unicode", params
+        ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def all(self):
+        """Return all operator records keyed by unicode name"""
+        return {record["unicode"]: record for record in self._query()}
+
+    def find_by_name(self, name):
+        """Return operators whose name matches exactly"""
+        return self._query("WHERE name = ?", (name,))
+
+    def find_by_series(self, series):
+        """Return operators belonging to a series index (e.g. 460)"""
+        return self._query("WHERE series = ?", (int(series),))
+
+    def find_by_color(self, hex_color, tolerance=30):
+        """Return operators whose average colour is within tolerance (euclidean RGB)"""
+        target = hex_to_rgb(hex_color)
+        shift = 8 - BUCKET_BITS
+        max_level = (1 << BUCKET_BITS) - 1
+
+        # Candidate buckets covering the tolerance cube around the target colour
+        ranges = [
+            range(max(0, (c - tolerance) >> shift), min(max_level, (c + tolerance) >> shift) + 1)
+            for c in target
+        ]
+        buckets = [
+            (r << (2 * BUCKET_BITS)) | (g << BUCKET_BITS) | b
+            for r in ranges[0] for g in ranges[1] for b in ranges[2]
+        ]
+
+        placeholders = ",".join("?" * len(buckets))
+        candidates = self._query(f"WHERE color_bucket IN ({placeholders})", buckets)
+
+        def distance(record):
+            return sum((a - b) ** 2 for a, b in zip(hex_to_rgb(record["hex"]), target)) ** 0.5
+
+        matches = [(distance(record), record) for record in candidates]
+        return [record for dist, record in sorted(matches, key=lambda m: m[0]) if dist <= tolerance]
+
+    def import_json(self, json_path):
+        """Load an operators_1.json file into the store"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return self.upsert_many(data.values())
+
+    def apply_delta(self, delta):
+        """Apply a change set to the store: upsert added and changed operators, delete removed ones"""
+        current = self.all()
+        updated = apply_delta(current, delta)
+        keys = sorted(set(delta["added"]) | set(delta["changed"]))
+        self.upsert_many(updated[key] for key in keys)
+        for key in delta["removed"]:
+            if key in current:
+                self.delete(key)
+        return len(keys) + len(delta["removed"])
+    
+    def seed_from_json(self, json_path):
+        """Fill an empty store from an existing operators_1.json; returns the number imported"""
+        if self.count() or not os.path.exists(json_path):
+            return 0
+        imported = self.import_json(json_path)
+        print(f"Imported {imported} operators from {json_path} into {self.db_path}")
+        return imported
+    
+    def export_json(self, output_json, summary_json=None):
+        """Regenerate operators_1.json (one record per line) and optionally operators.json from the store"""
+        data = sorted_operators(self.all())
+        write_operators(data, output_json)
+
+        if summary_json:
+            summary = {
+                key: {field: record[field] for field in SUMMARY_FIELDS if field in record}
+                for key, record in data.items()
+            }
+            with open(summary_json, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=4, ensure_ascii=False)
+
+        return len(data)
+
+
+def show_help():
+    """Show help information"""
+    print("=== Operator Store Utility ===")
+    print("Usage:")
+    print("  python operator_store.py import <json>        - Import operators_1.json into the store")
+    print("  python operator_store.py export <json> [sum]  - Export operators_1.json (and operators.json)")
+    print("  python operator_store.py name <name>          - Find operators by name")
+    print("  python operator_store.py series <index>       - Find operators by series index")
+    print("  python operator_store.py color <hex> [tol]    - Find operators near a colour")
+    print("  python operator_store.py delete <unicode>     - Remove an operator")
+    print("  python operator_store.py help                 - Show this help")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3:
+        show_help()
+        sys.exit(0)
+
+    store = OperatorStore()
+    command, arg = sys.argv[1], sys.argv[2]
+
+    if command == "import":
+        print(f"Imported {store.import_json(arg)} operators into {store.db_path}")
+    elif command == "export":
+        summary = sys.argv[3] if len(sys.argv) > 3 else None
+        print(f"Exported {store.export_json(arg, summary)} operators to {arg}")
+    elif command == "delete":
+        if store.get(arg) is None:
+            print(f"Unknown operator: {arg}")
+        else:
+            store.delete(arg)
+            print(f"Deleted {arg}; run 'operator_store.py export' or the next save to regenerate the JSON files")
+    elif command in ("name", "series", "color"):
+        if command == "name":
+            results = store.find_by_name(arg)
+        elif command == "series":
+            results = store.find_by_series(arg)
+        else:
+            tolerance = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+            results = store.find_by_color(arg, tolerance)
+        for record in results:
+            print(f"{record['name']} ({record['index']}) {record['hex']}")
+        print(f"{len(results)} operators found")
+    else:
+        print(f"Unknown command: {command}")
+        show_help()
+
+    store.close()
@@ -0,0 +1,663 @@
+import os
+import io
+import json
+import shutil
+import cv2
+import numpy as np
+from PIL import Image, ImageChops
+from datetime import datetime
+from operator_store import OperatorStore, hex_to_rgb
+from task_graph import Stage, TaskGraph
+from sprite_atlas import SpriteAtlas
+from similarity_index import SimilarityIndex
+from operator_delta import compute_changeset, summarize, load_json, write_operators, delta_path, baseline_path
+from sharding import shard_of, partial_path, find_partials, save_partial, merge_partials, remove_partials, parse_shard
+
+# Per-series colour corrections applied between crop and colour extraction.
+# Keys are filename suffixes; every pixel whose channels are all within
+# `tolerance` of `target` is replaced with `replacement`.
+COLOR_CORRECTIONS = {
+    # Dark-brown backing of the 460 series should read as white
+    "_460": [{"target": "#361a16", "tolerance": 20, "replacement": "#ffffff"}],
+}
+
+def corrections_for(name, corrections=COLOR_CORRECTIONS):
+    """Return the correction rules whose series suffix matches a file name"""
+    return [rule for suffix, rules in corrections.items() if name.endswith(suffix) for rule in rules]
+
+def apply_color_corrections(pixels, rules):
+    """Replace colours near each rule's target using boolean masks over the whole RGB array"""
+    signed = pixels.astype(np.int16)
+    for rule in rules:
+        target = np.array(hex_to_rgb(rule["target"]), dtype=np.int16)
+        mask = (np.abs(signed - target) <= rule["tolerance"]).all(axis=2)
+        pixels[mask] = hex_to_rgb(rule["replacement"])
+    return pixels
+
+class ImageProcessor:
+    CROP_SIZE = (200, 400)
+    PIXELATION_FACTOR = 20
+    COLOR_AREA = (40, 240, 160, 160)  # x, y, w, h of the average colour sample
+    GRID_SIZE = (10, 20)
+    PALETTE_TOLERANCE = 20
+    
+    def __init__(self, 
+                 input_folder="txz_imgs", 
+                 output_json="data/operators_1.json",
+                 temp_folders=["txz_imgs_1", "txz_imgs_crop", "txz_pixelated", "txz", "txz_imgs_corrected"],
+                 store_path="data/operators.db",
+                 atlas_dir="data/atlas",
+                 atlas_source="pixels",
+                 similarity_json="data/similarity.json",
+                 shard=None):
+        self.input_folder = input_folder
+        self.output_json = output_json
+        self.shard = shard  # (index, count) to process only one shard of the source files
+        if shard:
+            # Shards running side by side on one machine must not share temp folders
+            temp_folders = [f"{folder}_shard{shard[0]}of{shard[1]}" for folder in temp_folders]
+        self.temp_folders = temp_folders
+        self.summary_json = os.path.join(os.path.dirname(output_json), "operators.json")
+        self.delta_json = delta_path(output_json)
+        self.base_json = baseline_path(output_json)  # last deployed data, see `operator_delta.py baseline`
+        self.atlas_dir = atlas_dir
+        self.atlas_source = atlas_source  # "pixels" (palette/pixels grid) or "pixelated" (pixelated crops)
+        self.similarity_json = similarity_json
+        
+        # Keys touched during this run; those whose values changed are upserted on save
+        self.changed_keys = set()
+        
+        # Source provenance used to resolve conflicts when merging shards
+        self.renamed_sources = {}  # renamed file stem -> original filename
+        self.record_sources = {}   # unicode key -> {"file": ..., "index": ...}
+        
+        # The SQLite store is the system of record; seed it from the JSON file on first use
+        self.store = OperatorStore(store_path)
+        try:
+            self.store.seed_from_json(output_json)
+        except Exception as e:
+            print(f"Error importing existing data: {e}")
+        
+        # Load existing data if available
+        self.existing_data = self.store.all()
+        print(f"Loaded existing data with {len(self.existing_data)} operators")
+    
+    def chinese_to_unicode_key(self, name: str) -> str:
+        """Convert Chinese name to Unicode key"""
+        return ''.join(f'u{ord(char):04x}' for char in name)
+    
+    def sanitize_filename(self, name):
+        """Sanitize filename for safe saving"""
+        return "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).rstrip()
+    
+    def split_name_index(self, stem):
+        """Split a renamed file stem into (name, index)"""
+        # Handle filenames that may or may not have an index
+        if "_" in stem:
+            return stem.rsplit("_", 1)
+        return stem, "0"  # Default index for files without underscore
+    
+    def ordered_card_files(self, folder):
+        """List card images by (index, filename) so the highest index wins when names collide"""
+        filenames = [f for f in os.listdir(folder) if f.lower().endswith(".jpg")]
+        
+        def sort_key(filename):
+            index = self.split_name_index(filename[:-4])[1]
+            return (int(index) if index.isdigit() else 0, filename)
+        
+        return sorted(filenames, key=sort_key)
+    
+    def crop_card(self, img, stem):
+        """Crop a card image to its board area based on its series index, and resize it"""
+        def crop_with_xywh(image, x, y, w, h):
+            return image.crop((x, y, x + w, y + h))
+        
+        # Crop the image according to filenames
+        if stem.endswith("_70"):
+            img = crop_with_xywh(img, 128, 208, 109, 218)
+        elif stem.endswith("_20"):
+            img = crop_with_xywh(img, 127, 211, 105, 210)
+        elif stem.endswith("_360"):
+            img = crop_with_xywh(img, 118, 205, 126, 252)
+        elif stem.endswith("_410"):
+            img = crop_with_xywh(img, 117, 204, 126, 252)
+        elif stem.endswith("_440") or stem.endswith("_450"):
+            img = crop_with_xywh(img, 113, 207, 130, 250)
+        else:
+            img = crop_with_xywh(img, 113, 207, 132, 264)
+        
+        # Resize the image
+        return img.resize(self.CROP_SIZE, Image.LANCZOS)
+    
+    def pixelate_card(self, img):
+        """Pixelate an image by scaling each sampled pixel up to a block"""
+        img = img.convert("RGB")
+        factor = self.PIXELATION_FACTOR
+        width, height = img.size
+        
+        # Resize to smaller size
+        small_size = (width // factor, height // factor)
+        img_small = img.resize(small_size, Image.NEAREST)
+        
+        # Scale up each pixel block; any remainder at the edges stays black
+        blocks = np.asarray(img_small).repeat(factor, axis=0).repeat(factor, axis=1)
+        pixelated = np.zeros((height, width, 3), dtype=np.uint8)
+        pixelated[:blocks.shape[0], :blocks.shape[1]] = blocks
+        return Image.fromarray(pixelated)
+    
+    def average_color(self, img):
+        """Average colour of the colour sample area as a hex string"""
+        x, y, w, h = self.COLOR_AREA
+        cropped = np.asarray(img.convert("RGB").crop((x, y, x + w, y + h)))
+        
+        # Integer floor of the mean, as the palette has always been computed
+        pixels = cropped.reshape(-1, 3).astype(np.int64)
+        avg_color = tuple(int(c) for c in pixels.sum(axis=0) // len(pixels))
+        return "#{:02x}{:02x}{:02x}".format(*avg_color)
+    
+    def palette_and_pixels(self, img):
+        """Reduce a pixelated image to a palette and a grid of palette indices"""
+        grid_width, grid_height = self.GRID_SIZE
+        tolerance = self.PALETTE_TOLERANCE
+        
+        arr = np.asarray(img.convert("RGB")).astype(np.int64)
+        cell_h = arr.shape[0] // grid_height
+        cell_w = arr.shape[1] // grid_width
+        
+        # Per-cell integer average colour
+        cells = arr[:cell_h * grid_height, :cell_w * grid_width].reshape(grid_height, cell_h, grid_width, cell_w, 3)
+        averages = cells.sum(axis=(1, 3)) // (cell_h * cell_w)
+        
+        palette = []
+        pixel_grid = []
+        
+        for y in range(grid_height):
+            row = []
+            for x in range(grid_width):
+                avg = tuple(int(c) for c in averages[y, x])
+                
+                # First palette colour within tolerance, else a new palette entry
+                matched_index = None
+                for i, pc in enumerate(palette):
+                    if sum((a - b) ** 2 for a, b in zip(avg, pc)) ** 0.5 <= tolerance:
+                        matched_index = i
+                        break
+                
+                if matched_index is None:
+                    matched_index = len(palette)
+                    palette.append(avg)
+                
+                row.append(matched_index)
+            pixel_grid.append(row)
+        
+        # Convert palette to hex strings
+        return ['#{:02x}{:02x}{:02x}'.format(*c) for c in palette], pixel_grid
+    
+    def jpeg_roundtrip(self, img):
+        """Encode and decode as JPEG, as the file pipeline does between steps"""
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG")
+        buffer.seek(0)
+        return Image.open(buffer)
+    
+    def process_card(self, img, name, index):
+        """Run one card image through crop/correct/pixelate/colour/grid in memory and return its record"""
+        stem = f"{name}_{index}"
+        img = self.jpeg_roundtrip(self.crop_card(img, stem))
+        
+        rules = corrections_for(stem)
+        if rules:
+            img = self.jpeg_roundtrip(Image.fromarray(apply_color_corrections(np.array(img.convert("RGB")), rules)))
+        
+        hex_color = self.average_color(img)
+        palette, pixel_grid = self.palette_and_pixels(self.jpeg_roundtrip(self.pixelate_card(img)))
+        
+        unicode_name = self.chinese_to_unicode_key(name)
+        return {
+            "name": name,
+            "unicode": unicode_name,
+            "index": int(index),
+            "hex": hex_color,
+            "palette": palette,
+            "pixels": pixel_grid
+        }
+    
+    def step1_rename_and_filter(self):
+        """Step 1: Rename files and filter out unwanted ones"""
+        print("Step 1: Renaming and filtering images...")
+        
+        src_folder = self.input_folder
+        dst_folder = self.temp_folders[0]
+        os.makedirs(dst_folder, exist_ok=True)
+        
+        processed_count = 0
+        # Sorted so that when two sources map to the same name the last one wins deterministically
+        for filename in sorted(os.listdir(src_folder)):
+            if not filename.lower().endswith(".jpg"):
+                continue
+            
+            name = filename[:-4]  # Strip ".jpg"
+            parts = name.split("-")
+            
+            if len(parts) < 2:
+                continue  # Doesn't match expected pattern
+            
+            a = "-".join(parts[:-1])
+            b = parts[-1]
+            
+            # Filter out unwanted images - check entire filename
+            if any(term in filename for term in ["精英二", "精二", "sp", "SP", "演职认证"]):
+                continue
+            
+            # Extract numeric part from the last segment
+            numeric_part = ''.join(filter(str.isdigit, b))
+            if numeric_part:
+                a = f"{a}_{numeric_part}"
+            
+            # Save as "a.jpg" in destination
+            src_path = os.path.join(src_folder, filename)
+            dst_path = os.path.join(dst_folder, f"{a}.jpg")
+            
+            try:
+                if self.shard and shard_of(src_path, self.shard[1]) != self.shard[0]:
+                    continue
+                shutil.copyfile(src_path, dst_path)
+                self.renamed_sources[a] = filename
+                processed_count += 1
+                print(f"Processed: {filename} → {a}.jpg")
+            except Exception as e:
+                print(f"Error copying {filename}: {e}")
+        
+        print(f"Step 1 completed: {processed_count} images processed")
+        return processed_count
+    
+    def step2_crop_images(self):
+        """Step 2: Crop images to specific dimensions based on their index"""
+        print("Step 2: Cropping images...")
+        
+        src_folder = self.temp_folders[0]
+        dst_folder = self.temp_folders[1]
+        os.makedirs(dst_folder, exist_ok=True)
+        
+        processed_count = 0
+        
+        for filename in os.listdir(src_folder):
+            if not filename.lower().endswith(".jpg"):
+                continue
+            
+            src_path = os.path.join(src_folder, filename)
+            dst_path = os.path.join(dst_folder, filename)
+            
+            try:
+                with Image.open(src_path) as img:
+                    img = self.crop_card(img, filename[:-4])
+                    
+                    # Save the processed image
+                    img.save(dst_path, "JPEG")
+                    processed_count += 1
+                    print(f"Cropped: {filename}")
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
+        
+        print(f"Step 2 completed: {processed_count} images cropped")
+        return processed_count
+    
+    def step2b_correct_colors(self):
+        """Step 2b: Apply per-series colour corrections to the cropped images"""
+        print("Step 2b: Correcting series colours...")
+        
+        src_folder = self.temp_folders[1]
+        dst_folder = self.temp_folders[4]
+        os.makedirs(dst_folder, exist_ok=True)
+        
+        corrected_count = 0
+        
+        for filename in os.listdir(src_folder):
+            if not filename.lower().endswith(".jpg"):
+                continue
+            
+            src_path = os.path.join(src_folder, filename)
+            dst_path = os.path.join(dst_folder, filename)
+            rules = corrections_for(filename[:-4])
+            
+            try:
+                if not rules:
+                    shutil.copyfile(src_path, dst_path)
+                    continue
+                
+                with Image.open(src_path) as img:
+                    pixels = apply_color_corrections(np.array(img.convert("RGB")), rules)
+                Image.fromarray(pixels).save(dst_path, "JPEG")
+                corrected_count += 1
+                print(f"Corrected: {filename}")
+            except Exception as e:
+                print(f"Error correcting {filename}: {e}")
+        
+        print(f"Step 2b completed: {corrected_count} images corrected")
+        return corrected_count
+    
+    def step3_pixelate_images(self):
+        """Step 3: Pixelate images"""
+        print("Step 3: Pixelating images...")
+        
+        src_folder = self.temp_folders[4]
+        dst_folder = self.temp_folders[2]
+        os.makedirs(dst_folder, exist_ok=True)
+        
+        processed_count = 0
+        
+        for filename in os.listdir(src_folder):
+            if not filename.lower().endswith(".jpg"):
+                continue
+            
+            src_path = os.path.join(src_folder, filename)
+            dst_path = os.path.join(dst_folder, filename)
+            
+            try:
+                with Image.open(src_path) as img:
+                    pixelated_img = self.pixelate_card(img)
+                    
+                    pixelated_img.save(dst_path, "JPEG")
+                    processed_count += 1
+                    print(f"Pixelated: {filename}")
+            except Exception as e:
+                print(f"Error pixelating {filename}: {e}")
+        
+        print(f"Step 3 completed: {processed_count} images pixelated")
+        return processed_count
+    
+    def step4_convert_to_unicode_names(self):
+        """Step 4: Convert filenames to Unicode format"""
+        print("Step 4: Converting to Unicode names...")
+        
+        src_folder = self.temp_folders[2]
+        dst_folder = self.temp_folders[3]
+        os.makedirs(dst_folder, exist_ok=True)
+        
+        processed_count = 0
+        
+        for filename in self.ordered_card_files(src_folder):
+            name, index = self.split_name_index(filename[:-4])
+            unicode_name = self.chinese_to_unicode_key(name)
+            
+            src_path = os.path.join(src_folder, filename)
+            dst_path = os.path.join(dst_folder, f"{unicode_name}.jpg")
+            
+            try:
+                shutil.copyfile(src_path, dst_path)
+                processed_count += 1
+                print(f"Converted: {filename} → {unicode_name}.jpg")
+            except Exception as e:
+                print(f"Error converting {filename}: {e}")
+        
+        print(f"Step 4 completed: {processed_count} images converted")
+        return processed_count
+    
+    def step5_calculate_average_colors(self):
+        """Step 5: Calculate average colors for each image"""
+        print("Step 5: Calculating average colors...")
+        
+        src_folder = self.temp_folders[4]  # Use cropped (colour-corrected) images for color calculation
+        processed_count = 0
+        
+        for filename in self.ordered_card_files(src_folder):
+            name, index = self.split_name_index(filename[:-4])
+            unicode_name = self.chinese_to_unicode_key(name)
+            
+            src_path = os.path.join(src_folder, filename)
+            
+            try:
+                with Image.open(src_path) as img:
+                    hex_color = self.average_color(img)
+                    
+                    # Update or create operator data
+                    if unicode_name not in self.existing_data:
+                        self.existing_data[unicode_name] = {}
+                    
+                    self.existing_data[unicode_name].update({
+                        "name": name,
+                        "unicode": unicode_name,
+                        "index": int(index),
+                        "hex": hex_color
+                    })
+                    self.changed_keys.add(unicode_name)
+                    self.record_sources[unicode_name] = {
+                        "file": self.renamed_sources.get(filename[:-4], filename),
+                        "index": int(index)
+                    }
+                    
+                    processed_count += 1
+                    print(f"Color calculated: {name} → {hex_color}")
+            except Exception as e:
+                print(f"Error calculating color for {filename}: {e}")
+        
+        print(f"Step 5 completed: {processed_count} colors calculated")
+        return processed_count
+    
+    def step6_generate_palette_and_pixels(self):
+        """Step 6: Generate palette and pixel grid for each image"""
+        print("Step 6: Generating palette and pixel grids...")
+        
+        src_folder = self.temp_folders[3]  # Use Unicode-named images
+        processed_count = 0
+        
+        for filename in os.listdir(src_folder):
+            if not filename.lower().endswith(".jpg"):
+                continue
+            
+            unicode_name = filename[:-4]  # Remove .jpg extension
+            src_path = os.path.join(src_folder, filename)
+            
+            try:
+                if unicode_name in self.existing_data:
+                    with Image.open(src_path) as img:
+                        palette, pixel_grid = self.palette_and_pixels(img)
+                    self.existing_data[unicode_name].update({
+                        "palette": palette,
+                        "pixels": pixel_grid
+                    })
+                    self.changed_keys.add(unicode_name)
+                    processed_count += 1
+                    print(f"Palette generated: {unicode_name}")
+                else:
+                    print(f"Warning: {unicode_name} not found in existing data")
+            except Exception as e:
+                print(f"Error generating palette for {filename}: {e}")
+        
+        print(f"Step 6 completed: {processed_count} palettes generated")
+        return processed_count
+    
+    def save_json(self, records=None):
+        """Upsert changed operators into the store, regenerate the JSON files and the change set since the last deploy
+
+        Returns the number of operators written; raises if any write fails.
+        """
+        print("Saving updated JSON data...")
+        
+        try:
+            pending = records is None
+            if pending:
+                records = [self.existing_data[key] for key in sorted(self.changed_keys)]
+            
+            # Only records that differ from the stored value are written
+            before = self.store.all()
+            records = [record for record in records if before.get(record["unicode"]) != record]
+            if not os.path.exists(self.base_json):
+                # Without a deploy marker, the last exported data is the baseline
+                write_operators(before, self.base_json)
+            self.store.upsert_many(records)
+            print(f"Upserted {len(records)} operators into {self.store.db_path}")
+            
+            total = self.store.export_json(self.output_json, self.summary_json)
+            print(f"JSON data saved to {self.output_json}")
+            print(f"Total operators: {total}")
+            
+            # The change set accumulates every save since the baseline, so frequent saves lose nothing
+            changeset = compute_changeset(load_json(self.base_json), self.store.all())
+            with open(self.delta_json, 'w', encoding='utf-8') as f:
+                json.dump(changeset, f, indent=2, ensure_ascii=False)
+            print(f"Change set since {self.base_json} saved to {self.delta_json}: {summarize(changeset)}")
+            for record in records:
+                print(f"{'Updated' if record['unicode'] in before else 'Added'}: {record['name']}")
+        except Exception as e:
+            # Changed keys are kept so the records are written by the next save
+            print(f"Error saving JSON: {e}")
+            raise
+        
+        if pending:
+            self.changed_keys.clear()
+        return len(records)
+    
+    def save_shard(self):
+        """Write this shard's records and their sources to a partial result file"""
+        print("Saving partial shard result...")
+        
+        path = partial_path(self.output_json, *self.shard)
+        try:
+            records = {key: self.existing_data[key] for key in self.changed_keys}
+            save_partial(path, self.shard, records, self.record_sources)
+            print(f"Partial result saved to {path} ({len(records)} operators)")
+        except Exception as e:
+            print(f"Error saving partial result: {e}")
+            raise
+    
+    def merge_shards(self, paths=None, allow_partial=False):
+        """Merge partial shard results into the store, JSON files, atlas and similarity index"""
+        paths = paths or find_partials(self.output_json)
+        if not paths:
+            print("No partial results found")
+            return 0
+        
+        print(f"Merging {len(paths)} partial results...")
+        merged = merge_partials(paths, allow_partial=allow_partial)
+        for key, record in merged.items():
+            self.existing_data.setdefault(key, {}).update(record)
+            self.changed_keys.add(key)
+        print(f"Merged {len(merged)} operators")
+        
+        self.save_json()
+        remove_partials(paths)
+        print(f"Removed {len(paths)} merged partial results")
+        self.build_atlas()
+        self.build_similarity_index()
+        return len(merged)
+    
+    def build_atlas(self):
+        """Pack operator pixel art into texture atlas pages; only new or changed sprites are rendered"""
+        print("Building sprite atlas...")
+        
+        image_folder = self.temp_folders[3] if self.atlas_source == "pixelated" else None
+        try:
+            atlas = SpriteAtlas(output_dir=self.atlas_dir)
+            return atlas.update(self.existing_data, image_folder=image_folder)
+        except Exception as e:
+            print(f"Error building atlas: {e}")
+    
+    def build_similarity_index(self, k=10):
+        """Embed every operator's pixel grid and export top-k similar-card neighbour lists"""
+        print("Building similarity index...")
+        
+        try:
+            index = SimilarityIndex.from_records(self.existing_data)
+            index_path = os.path.splitext(self.similarity_json)[0] + ".npz"
+            index.export(self.similarity_json, k=k, index_path=index_path)
+            print(f"Similarity index saved to {self.similarity_json} ({len(index)} operators)")
+            return len(index)
+        except Exception as e:
+            print(f"Error building similarity index: {e}")
+    
+    def cleanup_temp_folders(self):
+        """Clean up temporary folders"""
+        print("Cleaning up temporary folders...")
+        
+        for folder in self.temp_folders:
+            if os.path.exists(folder):
+                try:
+                    shutil.rmtree(folder)
+                    print(f"Removed: {folder}")
+                except Exception as e:
+                    print(f"Error removing {folder}: {e}")
+    
+    def build_graph(self, graph=None, after=(), cleanup=True):
+        """Register the processing stages on a task graph with their declared inputs and outputs"""
+        graph = graph if graph is not None else TaskGraph()
+        t = self.temp_folders
+        
+        graph.add(Stage("rename", self.step1_rename_and_filter,
+                        inputs=[self.input_folder], outputs=[t[0]], after=after))
+        graph.add(Stage("crop", self.step2_crop_images,
+                        inputs=[t[0]], outputs=[t[1]], after=["rename"]))
+        graph.add(Stage("correct", self.step2b_correct_colors,
+                        inputs=[t[1]], outputs=[t[4]], after=["crop"]))
+        graph.add(Stage("pixelate", self.step3_pixelate_images,
+                        inputs=[t[4]], outputs=[t[2]], after=["correct"]))
+        graph.add(Stage("unicode", self.step4_convert_to_unicode_names,
+                        inputs=[t[2]], outputs=[t[3]], after=["pixelate"]))
+        # Colour extraction only needs the corrected crop, so it runs alongside pixelate/unicode
+        graph.add(Stage("colors", self.step5_calculate_average_colors,
+                        inputs=[t[4]], after=["correct"]))
+        graph.add(Stage("palette", self.step6_generate_palette_and_pixels,
+                        inputs=[t[3]], after=["unicode", "colors"]))
+        if self.shard:
+            # Shards only write a partial result; the atlas and similarity index are built on merge
+            graph.add(Stage("save", self.save_shard, after=["palette"]))
+            if cleanup:
+                graph.add(Stage("cleanup", self.cleanup_temp_folders, after=["save"]))
+            return graph
+        
+        graph.add(Stage("save", self.save_json, after=["palette"]))
+        graph.add(Stage("atlas", self.build_atlas, after=["palette"]))
+        graph.add(Stage("similarity", self.build_similarity_index, after=["palette"]))
+        if cleanup:
+            graph.add(Stage("cleanup", self.cleanup_temp_folders, after=["save", "atlas"]))
+        return graph
+    
+    def process_all(self, cleanup=True, only=None, start=None, force=False):
+        """Run the complete processing pipeline"""
+        print("Starting image processing pipeline...")
+        print(f"Input folder: {self.input_folder}")
+        print(f"Output JSON: {self.output_json}")
+        if self.shard:
+            print(f"Shard: {self.shard[0]}/{self.shard[1]}")
+        
+        start_time = datetime.now()
+        
+        # Unknown --only/--from stages raise ValueError before any work starts
+        graph = self.build_graph(cleanup=cleanup)
+        graph.select(only, start)
+        
+        try:
+            # Run all processing steps, independent stages concurrently
+            graph.run(only=only, start=start, force=force)
+            
+            end_time = datetime.now()
+            duration = end_time - start_time
+            print(f"Processing completed in {duration}")
+            
+        except Exception as e:
+            print(f"Error during processing: {e}")
+            raise
+
+def main():
+    """Main function to run the processor"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Process card images into operators_1.json")
+    parser.add_argument("command", nargs="?", default="process", choices=["process", "merge"])
+    parser.add_argument("partials", nargs="*", help="Partial result files to merge (default: all found)")
+    parser.add_argument("--shard", type=parse_shard, help="Process only shard i of N, e.g. 0/4")
+    parser.add_argument("--allow-partial", action="store_true", help="Merge even if some shards are missing")
+    args = parser.parse_args()
+    
+    if args.command == "merge":
+        processor = ImageProcessor()
+        try:
+            processor.merge_shards(args.partials, allow_partial=args.allow_partial)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        processor = ImageProcessor(shard=args.shard)
+        processor.process_all(cleanup=True)
+
+if __name__ == "__main__":
+    main()
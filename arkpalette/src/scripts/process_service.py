@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Resident processing service for on-demand card ingestion.
+
+Keeps the operator store and image decoders warm so single cards can be
+added without a full `update_workflow.py process` run. Cards go through the
+same crop/correct/pixelate/colour/grid logic as the batch pipeline, records
+are returned immediately and written to the data files at a fixed interval.
+
+Endpoints (JSON, localhost only):
+  POST /cards             {"cards": [{"name": ..., "index": ..., "image": <base64 jpg>}]}
+                          or a single card object; returns {"records": [...]}
+  GET  /operators/<key>   Current record for a unicode key
+  GET  /health            Operator count and number of unflushed records
+  POST /flush             Write pending records now
+"""
+
+import os
+import io
+import sys
+import copy
+import json
+import time
+import base64
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+from process_images import ImageProcessor
+
+
+class ProcessingService:
+    """Ingests cards into a warm ImageProcessor and flushes changes to disk periodically"""
+
+    def __init__(self, processor=None, flush_interval=5.0):
+        self.processor = processor or ImageProcessor()
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()        # Guards existing_data and changed_keys
+        self.flush_lock = threading.Lock()  # Serializes flushes from the timer, POST /flush and stop()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def ingest(self, cards):
+        """Process cards and stage their records for the next flush; returns the current record for each card
+
+        Follows the batch conflict rule: a card does not replace an existing
+        record with a higher series index, and that record is returned instead.
+        """
+        records = []
+        for card in cards:
+            name = card["name"]
+            index = int(card.get("index", 0))
+            with Image.open(io.BytesIO(base64.b64decode(card["image"]))) as img:
+                record = self.processor.process_card(img, name, index)
+
+            with self.lock:
+                existing = self.processor.existing_data.get(record["unicode"])
+                if existing and int(existing.get("index", 0)) > index:
+                    records.append(copy.deepcopy(existing))
+                    continue
+                self.processor.existing_data.setdefault(record["unicode"], {}).update(record)
+                self.processor.changed_keys.add(record["unicode"])
+            records.append(record)
+        return records
+
+    def get(self, unicode_name):
+        with self.lock:
+            return copy.deepcopy(self.processor.existing_data.get(unicode_name))
+
+    def health(self):
+        with self.lock:
+            return {
+                "operators": len(self.processor.existing_data),
+                "pending": len(self.processor.changed_keys),
+            }
+
+    def flush(self):
+        """Write pending records to the store and JSON files in one batch; failed records stay pending"""
+        with self.flush_lock:
+            with self.lock:
+                if not self.processor.changed_keys:
+                    return 0
+                keys = sorted(self.processor.changed_keys)
+                records = [copy.deepcopy(self.processor.existing_data[key]) for key in keys]
+                self.processor.changed_keys.clear()
+
+            # Disk writes happen outside the data lock so ingestion is not blocked
+            try:
+                self.processor.save_json(records)
+            except Exception:
+                with self.lock:
+                    self.processor.changed_keys.update(keys)
+                raise
+            return len(records)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Error flushing: {e}")
+
+    def start(self):
+        """Start the periodic flush thread"""
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        """Stop the flush thread and write anything still pending"""
+        self._stop.set()
+        if self._flusher:
+            self._flusher.join()
+        self.flush()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None  # Set by make_server
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.service.health())
+        elif self.path.startswith("/operators/"):
+            record = self.service.get(self.path[len("/operators/"):])
+            if record:
+                self._send_json(200, record)
+            else:
+                self._send_json(404, {"error": "operator not found"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path == "/flush":
+            try:
+                self._send_json(200, {"flushed": self.service.flush()})
+            except Exception as e:
+                self._send_json(500, {"error": f"flush failed: {e}"})
+            return
+        if self.path != "/cards":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        start_time = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            cards = payload["cards"] if "cards" in payload else [payload]
+            records = self.service.ingest(cards)
+        except (KeyError, ValueError, TypeError, OSError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self._send_json(200, {"records": records, "elapsed_ms": round(elapsed_ms, 2)})
+
+    def log_message(self, format, *args):
+        pass  # Keep the console readable under load
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    """Create a threaded HTTP server bound to the service"""
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(host="127.0.0.1", port=8765, flush_interval=5.0):
+    """Run the service until interrupted"""
+    service = ProcessingService(flush_interval=flush_interval)
+    server = make_server(service, host, port)
+    service.start()
+    print(f"🚀 Processing service listening on http://{host}:{port} (flush every {flush_interval}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        service.stop()
+
+
+def sample_cards(input_folder, limit):
+    """Load sample cards from crawled images, named the way step 1 renames them"""
+    cards = []
+    for filename in sorted(os.listdir(input_folder)):
+        parts = filename[:-4].split("-")
+        if not filename.lower().endswith(".jpg") or len(parts) < 2:
+            continue
+        if any(term in filename for term in ["精英二", "精二", "sp", "SP", "演职认证"]):
+            continue
+        index = ''.join(filter(str.isdigit, parts[-1]))
+        with open(os.path.join(input_folder, filename), 'rb') as f:
+            image = base64.b64encode(f.read()).decode('ascii')
+        cards.append({"name": "-".join(parts[:-1]), "index": int(index or 0), "image": image})
+        if len(cards) >= limit:
+            break
+    return cards
+
+
+def load_test(url="http://127.0.0.1:8765", clients=8, requests_per_client=25, batch=1, input_folder="txz_imgs"):
+    """Drive a running service with concurrent local clients and report latency percentiles"""
+    import urllib.request
+
+    cards = sample_cards(input_folder, 50)
+    if not cards:
+        print(f"No sample images found in {input_folder}")
+        return None
+
+    latencies = []
+    errors = []
+    latency_lock = threading.Lock()
+
+    def client(client_id):
+        for i in range(requests_per_client):
+            start = (client_id * requests_per_client + i) * batch
+            payload = {"cards": [cards[(start + j) % len(cards)] for j in range(batch)]}
+            request = urllib.request.Request(
+                f"{url}/cards", data=json.dumps(payload).encode('utf-8'),
+                headers={"Content-Type": "application/json"}, method="POST")
+            began = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+                elapsed = (time.perf_counter() - began) * 1000
+                with latency_lock:
+                    latencies.append(elapsed)
+            except Exception as e:
+                with latency_lock:
+                    errors.append(str(e))
+
+    print(f"📈 Load test: {clients} clients × {requests_per_client} requests × {batch} cards → {url}")
+    began = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - began
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] if latencies else 0.0
+
+    result = {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "cards_per_second": round(len(latencies) * batch / duration, 1),
+        "p50_ms": round(percentile(50), 1),
+        "p95_ms": round(percentile(95), 1),
+        "p99_ms": round(percentile(99), 1),
+    }
+    print(f"✅ {result['requests']} requests, {result['errors']} errors in {duration:.2f}s "
+          f"({result['cards_per_second']} cards/s)")
+    print(f"⏱️  p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+    return result
+
+
+def show_help():
+    """Show help information"""
+    print("ARK Palette Processing Service")
+    print("=" * 40)
+    print("Usage:")
+    print("  python process_service.py serve [--port 8765] [--flush-interval 5]")
+    print("  python process_service.py loadtest [--clients 8] [--requests 25] [--batch 1]")
+    print("  python process_service.py help")
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--flush-interval", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--input", default="txz_imgs")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.flush_interval)
+    elif args.command == "loadtest":
+        result = load_test(f"http://{args.host}:{args.port}", args.clients, args.requests, args.batch, args.input)
+        if not result or result["errors"]:
+            sys.exit(1)
+    else:
+        show_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Helpers for sharded processing.
+
+Source images are assigned to shards by the SHA-1 of their content, so the
+assignment does not depend on file order or on which machine runs a shard.
+Each shard writes a partial result file; merging them is deterministic.
+
+Conflict rule: when several source images map to the same unicode key
+(e.g. the same operator in two series), the record from the image with the
+highest series index wins; ties are broken by the lexicographically greatest
+source filename. Single-node runs process files in the same order, so a
+merge of all shards equals a single-node run.
+"""
+
+import os
+import glob
+import json
+import hashlib
+
+
+def parse_shard(value):
+    """Parse 'i/N' into (i, N)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{value}', expected 0 <= i < N")
+    return index, count
+
+
+def shard_of(path, count):
+    """Shard number of a source file, from the hash of its content"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return int(digest.hexdigest(), 16) % count
+
+
+def resolution_key(index, source):
+    """Sort key implementing the conflict rule: the greatest key wins"""
+    return (int(index), source)
+
+
+def partial_path(output_json, index, count):
+    """Partial result file written by one shard"""
+    return f"{os.path.splitext(output_json)[0]}.shard-{index}-of-{count}.json"
+
+
+def find_partials(output_json):
+    """All partial result files next to output_json"""
+    return sorted(glob.glob(f"{os.path.splitext(output_json)[0]}.shard-*-of-*.json"))
+
+
+def save_partial(path, shard, records, sources):
+    """Write a shard's records and their source provenance"""
+    data = {
+        "shard": list(shard),
+        "records": {key: records[key] for key in sorted(records)},
+        "sources": {key: sources[key] for key in sorted(sources)},
+    }
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=None, ensure_ascii=False)
+
+
+def merge_partials(paths, allow_partial=False):
+    """Combine partial results into one {unicode: record} dict using the conflict rule
+
+    Raises ValueError when shards are missing, unless allow_partial is set.
+    """
+    partials = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            partials.append(json.load(f))
+
+    counts = {partial["shard"][1] for partial in partials}
+    if len(counts) > 1:
+        raise ValueError(f"Partial results come from different shard counts: {sorted(counts)}")
+    if counts:
+        count = counts.pop()
+        missing = set(range(count)) - {partial["shard"][0] for partial in partials}
+        if missing and not allow_partial:
+            raise ValueError(f"Missing partial results for shards {sorted(missing)} of {count} "
+                             f"(use --allow-partial to merge anyway)")
+        if missing:
+            print(f"Warning: missing partial results for shards {sorted(missing)} of {count}")
+
+    winners = {}
+    for partial in partials:
+        for key, record in partial["records"].items():
+            source = partial["sources"].get(key, {"file": "", "index": record.get("index", 0)})
+            rank = resolution_key(source["index"], source["file"])
+            if key not in winners or rank > winners[key][0]:
+                winners[key] = (rank, record)
+
+    return {key: winners[key][1] for key in sorted(winners)}
+
+
+def remove_partials(paths):
+    """Delete merged partial results so a later merge cannot pick them up again"""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def verify_shards(count, input_folder="txz_imgs", base_json="data/operators_1.json"):
+    """Run a single-node process and `count` local shard processes plus a merge, and compare outputs"""
+    import sys
+    import shutil
+    import filecmp
+    import tempfile
+    import subprocess
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "process_images.py")
+    workspace = tempfile.mkdtemp(prefix="arkpalette_shards_")
+
+    def prepare(name):
+        workdir = os.path.join(workspace, name)
+        os.makedirs(os.path.join(workdir, "data"))
+        os.symlink(os.path.abspath(input_folder), os.path.join(workdir, "txz_imgs"))
+        if os.path.exists(base_json):
+            shutil.copyfile(base_json, os.path.join(workdir, "data", "operators_1.json"))
+        return workdir
+
+    def run(args, workdir, log_name):
+        with open(os.path.join(workspace, f"{log_name}.log"), 'w', encoding='utf-8') as log:
+            return subprocess.Popen([sys.executable, script] + args, cwd=workdir,
+                                    stdout=log, stderr=subprocess.STDOUT)
+
+    single = prepare("single")
+    sharded = prepare("sharded")
+
+    print(f"Running single-node and {count} shard processes in {workspace}...")
+    processes = [run([], single, "single")]
+    processes += [run(["--shard", f"{i}/{count}"], sharded, f"shard-{i}") for i in range(count)]
+    if any([process.wait() for process in processes]):
+        print(f"❌ A process failed, see logs in {workspace}")
+        return False
+
+    if run(["merge"], sharded, "merge").wait():
+        print(f"❌ Merge failed, see logs in {workspace}")
+        return False
+
+    identical = True
+    for filename in ("operators_1.json", "operators.json"):
+        same = filecmp.cmp(os.path.join(single, "data", filename),
+                           os.path.join(sharded, "data", filename), shallow=False)
+        print(f"{'✅' if same else '❌'} {filename} {'identical' if same else 'differs'}")
+        identical = identical and same
+
+    if identical:
+        shutil.rmtree(workspace, ignore_errors=True)
+    else:
+        print(f"Outputs kept in {workspace}")
+    return identical
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "verify":
+        input_folder = sys.argv[3] if len(sys.argv) > 3 else "txz_imgs"
+        sys.exit(0 if verify_shards(int(sys.argv[2]), input_folder) else 1)
+    print("Usage:")
+    print("  python sharding.py verify <N> [input_folder] - Check that N merged shards equal a single-node run")
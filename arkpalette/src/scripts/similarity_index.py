@@ -0,0 +1,281 @@
+import os
+import json
+import numpy as np
+
+GRID_WIDTH, GRID_HEIGHT = 10, 20
+EMBEDDING_DIM = GRID_WIDTH * GRID_HEIGHT * 3
+
+# sRGB (D65) to XYZ conversion matrix and reference white
+RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+], dtype=np.float32)
+WHITE_D65 = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+
+def rgb_to_lab(rgb):
+    """Convert an (..., 3) uint8 sRGB array to CIELAB"""
+    c = rgb.astype(np.float32) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = (c @ RGB_TO_XYZ.T) / WHITE_D65
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def embed_record(record):
+    """Fixed-length embedding: the Lab colour of every cell of the 10x20 grid, row-major"""
+    palette = np.array(
+        [[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in record["palette"]],
+        dtype=np.uint8,
+    )
+    pixels = np.array(record["pixels"], dtype=np.intp)
+    if pixels.shape != (GRID_HEIGHT, GRID_WIDTH):
+        raise ValueError(f"Unexpected pixel grid shape {pixels.shape}")
+    return rgb_to_lab(palette[pixels]).reshape(-1).astype(np.float32)
+
+
+def _squared_distances(queries, vectors, vector_norms):
+    """Squared euclidean distances between every query and every vector"""
+    query_norms = np.einsum('ij,ij->i', queries, queries)
+    d2 = query_norms[:, None] + vector_norms[None, :] - 2.0 * (queries @ vectors.T)
+    return np.maximum(d2, 0.0)
+
+
+def _top_k(d2, k):
+    """Indices and values of the k smallest entries per row, sorted ascending"""
+    k = min(k, d2.shape[1])
+    if k <= 0:
+        return np.zeros((len(d2), 0), dtype=np.intp), np.zeros((len(d2), 0), dtype=d2.dtype)
+    idx = np.argpartition(d2, k - 1, axis=1)[:, :k]
+    part = np.take_along_axis(d2, idx, axis=1)
+    order = np.argsort(part, axis=1, kind='stable')
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(part, order, axis=1)
+
+
+def _kmeans(data, k, iterations, rng):
+    """Plain Lloyd's k-means used to train product-quantizer codebooks"""
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = _squared_distances(data, centroids, np.einsum('ij,ij->i', centroids, centroids)).argmin(axis=1)
+        for c in range(k):
+            members = data[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+    return centroids
+
+
+class SimilarityIndex:
+    """Nearest-neighbour index over operator pixel-art embeddings (exact blocked search, optional PQ)"""
+
+    def __init__(self, keys, embeddings, names=None):
+        self.keys = list(keys)
+        self.names = list(names) if names is not None else list(keys)
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.norms = np.einsum('ij,ij->i', self.embeddings, self.embeddings)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.codebooks = None
+        self.codes = None
+
+    @classmethod
+    def from_records(cls, records):
+        """Build an index from operator records that have a palette and pixel grid"""
+        keys, names, vectors = [], [], []
+        for key in sorted(records):
+            record = records[key]
+            if not record.get("palette") or not record.get("pixels"):
+                continue
+            try:
+                vectors.append(embed_record(record))
+            except Exception as e:
+                print(f"Error embedding {key}: {e}")
+                continue
+            keys.append(key)
+            names.append(record.get("name", key))
+        embeddings = np.stack(vectors) if vectors else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        return cls(keys, embeddings, names)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def to_distance(d2):
+        """Turn squared embedding distances into an RMS per-cell Lab colour difference"""
+        return np.sqrt(d2 / (GRID_WIDTH * GRID_HEIGHT))
+
+    def build_pq(self, subspaces=20, centroids=256, iterations=15, seed=0):
+        """Compress embeddings with a product quantizer (one subspace per grid row by default)"""
+        if EMBEDDING_DIM % subspaces:
+            raise ValueError(f"{EMBEDDING_DIM} dimensions cannot be split into {subspaces} subspaces")
+        if len(self) == 0:
+            raise ValueError("Cannot build a product quantizer on an empty index")
+        rng = np.random.default_rng(seed)
+        k = min(centroids, len(self))
+        parts = self.embeddings.reshape(len(self), subspaces, -1)
+
+        self.codebooks = np.stack([_kmeans(parts[:, m], k, iterations, rng) for m in range(subspaces)])
+        self.codes = np.empty((len(self), subspaces), dtype=np.uint8)
+        for m in range(subspaces):
+            books = self.codebooks[m]
+            self.codes[:, m] = _squared_distances(
+                parts[:, m], books, np.einsum('ij,ij->i', books, books)
+            ).argmin(axis=1)
+        return self.codes
+
+    def _pq_squared_distances(self, queries):
+        """Asymmetric distances from raw queries to PQ-encoded vectors via per-subspace lookup tables"""
+        subspaces = self.codebooks.shape[0]
+        parts = queries.reshape(len(queries), subspaces, -1)
+        d2 = np.zeros((len(queries), len(self)), dtype=np.float32)
+        for m in range(subspaces):
+            books = self.codebooks[m]
+            table = _squared_distances(parts[:, m], books, np.einsum('ij,ij->i', books, books))
+            d2 += table[:, self.codes[:, m]]
+        return d2
+
+    def search(self, queries, k=10, block_size=1024, use_pq=False, exclude=None):
+        """Return (indices, distances) of the k nearest vectors for each query, in blocks of queries"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if use_pq and self.codes is None:
+            raise ValueError("Product quantizer not built, call build_pq() first")
+
+        all_idx, all_dist = [], []
+        if len(queries) == 0 or len(self) == 0:
+            return np.zeros((len(queries), 0), dtype=np.intp), np.zeros((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(queries), block_size):
+            block = queries[start:start + block_size]
+            if use_pq:
+                d2 = self._pq_squared_distances(block)
+            else:
+                d2 = _squared_distances(block, self.embeddings, self.norms)
+            if exclude is not None:
+                rows = np.arange(len(block))
+                d2[rows, exclude[start:start + block_size]] = np.inf
+            idx, part = _top_k(d2, k)
+            all_idx.append(idx)
+            all_dist.append(self.to_distance(part))
+        return np.concatenate(all_idx), np.concatenate(all_dist)
+
+    def query(self, target, k=10, use_pq=False):
+        """Top-k operators similar to a unicode key or an operator record, as (key, name, distance)"""
+        exclude = None
+        if isinstance(target, str):
+            if target not in self.positions:
+                raise KeyError(f"Unknown operator: {target}")
+            position = self.positions[target]
+            vector = self.embeddings[position]
+            exclude = np.array([position])
+        else:
+            vector = embed_record(target)
+
+        idx, dist = self.search(vector, k=k, use_pq=use_pq, exclude=exclude)
+        return [(self.keys[i], self.names[i], float(d)) for i, d in zip(idx[0], dist[0]) if np.isfinite(d)]
+
+    def all_neighbors(self, k=10, block_size=1024, use_pq=False):
+        """Top-k neighbour lists for every operator in the catalog"""
+        idx, dist = self.search(self.embeddings, k=k, block_size=block_size, use_pq=use_pq,
+                                exclude=np.arange(len(self)))
+        return {
+            key: [[self.keys[j], round(float(d), 2)] for j, d in zip(idx[i], dist[i]) if np.isfinite(d)]
+            for i, key in enumerate(self.keys)
+        }
+
+    def near_duplicates(self, threshold=5.0, k=10):
+        """Cluster operators whose card art differs by less than threshold (RMS Lab difference)"""
+        parent = list(range(len(self)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        idx, dist = self.search(self.embeddings, k=k, exclude=np.arange(len(self)))
+        for i in range(len(self)):
+            for j, d in zip(idx[i], dist[i]):
+                if d <= threshold:
+                    parent[find(i)] = find(j)
+
+        clusters = {}
+        for i in range(len(self)):
+            clusters.setdefault(find(i), []).append(self.keys[i])
+        return sorted((members for members in clusters.values() if len(members) > 1), key=len, reverse=True)
+
+    def save(self, path):
+        """Save embeddings (and PQ codes if built) to an .npz file"""
+        arrays = {"keys": np.array(self.keys), "names": np.array(self.names), "embeddings": self.embeddings}
+        if self.codes is not None:
+            arrays.update(codebooks=self.codebooks, codes=self.codes)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with save()"""
+        with np.load(path) as data:
+            index = cls(data["keys"].tolist(), data["embeddings"], data["names"].tolist())
+            if "codes" in data:
+                index.codebooks = data["codebooks"]
+                index.codes = data["codes"]
+        return index
+
+    def export(self, neighbors_json, k=10, index_path=None):
+        """Export top-k neighbour lists as JSON (and the index itself as .npz)"""
+        if os.path.dirname(neighbors_json):
+            os.makedirs(os.path.dirname(neighbors_json), exist_ok=True)
+        with open(neighbors_json, 'w', encoding='utf-8') as f:
+            json.dump(self.all_neighbors(k=k), f, indent=None, ensure_ascii=False)
+        if index_path:
+            self.save(index_path)
+
+
+def show_help():
+    """Show help information"""
+    print("=== Similarity Index Utility ===")
+    print("Usage:")
+    print("  python similarity_index.py build [json]        - Build index and export neighbour lists")
+    print("  python similarity_index.py query <name> [k]    - Find operators with similar card art")
+    print("  python similarity_index.py duplicates [thresh] - List clusters of near-identical cards")
+    print("  python similarity_index.py help                - Show this help")
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2 or sys.argv[1] == "help":
+        show_help()
+        sys.exit(0)
+
+    command = sys.argv[1]
+    input_json = sys.argv[2] if command == "build" and len(sys.argv) > 2 else "data/operators_1.json"
+    with open(input_json, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    index = SimilarityIndex.from_records(records)
+
+    if command == "build":
+        index.export("data/similarity.json", index_path="data/similarity.npz")
+        print(f"Indexed {len(index)} operators")
+    elif command == "query" and len(sys.argv) > 2:
+        by_name = {record["name"]: key for key, record in records.items()}
+        target = by_name.get(sys.argv[2], sys.argv[2])
+        k = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+        if target not in index.positions:
+            print(f"Unknown operator: {sys.argv[2]}")
+            sys.exit(1)
+        start = time.perf_counter()
+        results = index.query(target, k=k)
+        elapsed = (time.perf_counter() - start) * 1000
+        for key, name, distance in results:
+            print(f"{name}: {distance:.2f}")
+        print(f"Query took {elapsed:.2f} ms")
+    elif command == "duplicates":
+        threshold = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+        for cluster in index.near_duplicates(threshold):
+            print(", ".join(records[key]["name"] for key in cluster))
+    else:
+        print(f"Unknown command: {command}")
+        show_help()
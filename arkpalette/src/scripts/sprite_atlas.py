@@ -0,0 +1,224 @@
+import os
+import re
+import json
+import hashlib
+import numpy as np
+from PIL import Image
+
+# Colour of empty slots, including slots freed by removed operators
+BACKGROUND = (255, 255, 255)
+
+# Page files written by any supported format, e.g. atlas_0.png
+PAGE_PATTERN = re.compile(r"^atlas_\d+\.(png|webp)$")
+
+
+class SpriteAtlas:
+    """Packs every operator's pixel art into fixed-slot texture atlas pages with a JSON coordinate map"""
+
+    def __init__(self,
+                 output_dir="data/atlas",
+                 cell_size=8,
+                 grid_size=(10, 20),
+                 columns=32,
+                 rows=16,
+                 image_format="png"):
+        self.output_dir = output_dir
+        self.cell_size = cell_size
+        self.grid_width, self.grid_height = grid_size
+        self.sprite_width = self.grid_width * cell_size
+        self.sprite_height = self.grid_height * cell_size
+        self.columns = columns
+        self.rows = rows
+        self.image_format = image_format.lower()
+        self.map_path = os.path.join(output_dir, "atlas.json")
+        self.frames = {}
+        self.pages = []
+
+        self.load_map()
+
+    @property
+    def slots_per_page(self):
+        return self.columns * self.rows
+
+    def load_map(self):
+        """Load the existing coordinate map if its layout matches the current settings"""
+        if not os.path.exists(self.map_path):
+            return
+
+        try:
+            with open(self.map_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading atlas map: {e}")
+            return
+
+        layout = (data.get("cellSize"), data.get("columns"), data.get("rows"), data.get("format"))
+        if layout != (self.cell_size, self.columns, self.rows, self.image_format):
+            print("Atlas layout changed, repacking from scratch")
+            return
+
+        self.frames = data.get("frames", {})
+        self.pages = data.get("pages", [])
+
+    def save_map(self):
+        """Write the coordinate map keyed by unicode key"""
+        data = {
+            "cellSize": self.cell_size,
+            "spriteWidth": self.sprite_width,
+            "spriteHeight": self.sprite_height,
+            "columns": self.columns,
+            "rows": self.rows,
+            "format": self.image_format,
+            "pages": self.pages,
+            "frames": dict(sorted(self.frames.items())),
+        }
+        with open(self.map_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=None, ensure_ascii=False)
+
+    def record_hash(self, record):
+        """Content hash of an operator's palette and pixel grid"""
+        content = json.dumps([record.get("palette"), record.get("pixels")], separators=(',', ':'))
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+    def render_from_pixels(self, record):
+        """Render a sprite from the palette / pixels grid of an operator record"""
+        palette = np.array(
+            [[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in record["palette"]],
+            dtype=np.uint8,
+        )
+        grid = palette[np.array(record["pixels"], dtype=np.intp)]
+        grid = grid.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1)
+        return Image.fromarray(grid, "RGB")
+
+    def render_from_image(self, image_path):
+        """Render a sprite from a pixelated crop by sampling one pixel per block"""
+        with Image.open(image_path) as img:
+            small = img.convert("RGB").resize((self.grid_width, self.grid_height), Image.NEAREST)
+        return small.resize((self.sprite_width, self.sprite_height), Image.NEAREST)
+
+    def page_name(self, page):
+        return f"atlas_{page}.{self.image_format}"
+
+    def slot_position(self, slot):
+        """Return (page, x, y) of a slot"""
+        page, index = divmod(slot, self.slots_per_page)
+        row, column = divmod(index, self.columns)
+        return page, column * self.sprite_width, row * self.sprite_height
+
+    def allocate_slots(self, count):
+        """Return the lowest free slots, so new operators are appended without moving existing ones"""
+        used = {frame["slot"] for frame in self.frames.values()}
+        slots = []
+        slot = 0
+        while len(slots) < count:
+            if slot not in used:
+                slots.append(slot)
+            slot += 1
+        return slots
+
+    def open_page(self, page):
+        path = os.path.join(self.output_dir, self.page_name(page))
+        if os.path.exists(path):
+            with Image.open(path) as img:
+                return img.convert("RGB")
+        size = (self.columns * self.sprite_width, self.rows * self.sprite_height)
+        return Image.new("RGB", size, BACKGROUND)
+
+    def save_page(self, image, page):
+        path = os.path.join(self.output_dir, self.page_name(page))
+        if self.image_format == "webp":
+            image.save(path, "WEBP", lossless=True)
+        else:
+            image.save(path, "PNG", optimize=True)
+
+    def remove_stale_pages(self):
+        """Delete page files that are no longer listed in the map"""
+        for name in sorted(os.listdir(self.output_dir)):
+            if PAGE_PATTERN.match(name) and name not in self.pages:
+                os.remove(os.path.join(self.output_dir, name))
+                print(f"Atlas: deleted {name}")
+
+    def update(self, records, image_folder=None, prune=True):
+        """Render new or changed operators into their slots; only touched pages are rewritten"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Slots of removed operators are blanked so their art does not stay on the page
+        cleared = {}
+        if prune:
+            for key in [key for key in self.frames if key not in records]:
+                page, x, y = self.slot_position(self.frames.pop(key)["slot"])
+                cleared.setdefault(page, []).append((x, y))
+                print(f"Atlas: removed {key}")
+
+        pending = {}
+        for key in sorted(records):
+            record = records[key]
+            image_path = os.path.join(image_folder, f"{key}.jpg") if image_folder else None
+
+            if image_path and os.path.exists(image_path):
+                with open(image_path, 'rb') as f:
+                    content_hash = hashlib.sha1(f.read()).hexdigest()[:16]
+                source = image_path
+            elif record.get("palette") and record.get("pixels"):
+                content_hash = self.record_hash(record)
+                source = None
+            else:
+                continue
+
+            frame = self.frames.get(key)
+            if frame and frame["hash"] == content_hash:
+                continue
+            pending[key] = (source, content_hash)
+
+        new_keys = [key for key in pending if key not in self.frames]
+        for key, slot in zip(new_keys, self.allocate_slots(len(new_keys))):
+            self.frames[key] = {"slot": slot}
+
+        # Group sprites by page so each page is opened and saved once
+        by_page = {}
+        for key, (source, content_hash) in pending.items():
+            page, x, y = self.slot_position(self.frames[key]["slot"])
+            self.frames[key].update({
+                "page": page, "x": x, "y": y,
+                "w": self.sprite_width, "h": self.sprite_height,
+                "hash": content_hash,
+            })
+            by_page.setdefault(page, []).append((key, source, x, y))
+
+        page_count = max((frame["page"] for frame in self.frames.values()), default=-1) + 1
+        self.pages = [self.page_name(page) for page in range(page_count)]
+
+        for page in sorted(set(by_page) | {page for page in cleared if page < page_count}):
+            image = self.open_page(page)
+            for x, y in cleared.get(page, []):
+                image.paste(BACKGROUND, (x, y, x + self.sprite_width, y + self.sprite_height))
+            for key, source, x, y in by_page.get(page, []):
+                sprite = self.render_from_image(source) if source else self.render_from_pixels(records[key])
+                image.paste(sprite, (x, y))
+            self.save_page(image, page)
+            print(f"Atlas: packed {len(by_page.get(page, []))} sprites and cleared {len(cleared.get(page, []))} slots "
+                  f"in {self.page_name(page)}")
+
+        self.remove_stale_pages()
+        self.save_map()
+
+        print(f"Atlas: {len(pending)} sprites updated, {len(self.frames)} total in {len(self.pages)} pages")
+        return len(pending)
+
+
+def main():
+    """Build or update the atlas from an operators_1.json file"""
+    import sys
+
+    input_json = sys.argv[1] if len(sys.argv) > 1 else "data/operators_1.json"
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else "data/atlas"
+
+    with open(input_json, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    atlas = SpriteAtlas(output_dir=output_dir)
+    atlas.update(records)
+
+
+if __name__ == "__main__":
+    main()
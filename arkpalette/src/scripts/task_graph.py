@@ -0,0 +1,103 @@
+import os
+import asyncio
+from datetime import datetime
+
+
+def _mtimes(paths):
+    """Yield modification times of the given files, or of the files inside given folders"""
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in os.scandir(path):
+                if entry.is_file():
+                    yield entry.stat().st_mtime
+        elif os.path.exists(path):
+            yield os.path.getmtime(path)
+
+
+class Stage:
+    """A pipeline stage with declared inputs, outputs and upstream stages"""
+
+    def __init__(self, name, func, inputs=(), outputs=(), after=()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+
+    def is_up_to_date(self):
+        """A stage is up to date when all outputs exist and are newer than every input"""
+        if not self.outputs or not all(os.path.exists(path) for path in self.outputs):
+            return False
+        output_times = list(_mtimes(self.outputs))
+        if not output_times:
+            return False
+        input_times = list(_mtimes(self.inputs))
+        return not input_times or min(output_times) >= max(input_times)
+
+
+class TaskGraph:
+    """Runs stages concurrently with asyncio as soon as their upstream stages have finished"""
+
+    def __init__(self, stages=()):
+        self.stages = {}
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage):
+        """Register a stage; upstream stages must already be registered"""
+        for dep in stage.after:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        self.stages[stage.name] = stage
+        return stage
+
+    def descendants(self, name):
+        """Return the stage and every stage that (transitively) runs after it"""
+        selected = {name}
+        for stage in self.stages.values():
+            if any(dep in selected for dep in stage.after):
+                selected.add(stage.name)
+        return selected
+
+    def select(self, only=None, start=None):
+        """Resolve --only / --from selection into a set of stage names"""
+        names = set(self.stages)
+        if only:
+            unknown = set(only) - names
+            if unknown:
+                raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+            names = set(only)
+        if start:
+            if start not in self.stages:
+                raise ValueError(f"Unknown stage: {start}")
+            names &= self.descendants(start)
+        return names
+
+    async def _run_stage(self, stage, done, force):
+        # Wait for upstream stages that are part of this run
+        await asyncio.gather(*(done[dep] for dep in stage.after if dep in done))
+
+        if not force and stage.is_up_to_date():
+            print(f"⏭️  Skipping {stage.name} (up to date)")
+            return None
+
+        print(f"▶️  Starting {stage.name}")
+        start_time = datetime.now()
+        result = await asyncio.to_thread(stage.func)
+        print(f"✅ Finished {stage.name} in {datetime.now() - start_time}")
+        return result
+
+    async def run_async(self, only=None, start=None, force=False):
+        """Run the selected stages, returning a dict of stage results"""
+        selected = self.select(only, start)
+        done = {}
+        # Stages are registered after their dependencies, so futures exist before they are awaited
+        for name, stage in self.stages.items():
+            if name in selected:
+                done[name] = asyncio.ensure_future(self._run_stage(stage, done, force))
+        results = await asyncio.gather(*done.values())
+        return dict(zip(done.keys(), results))
+
+    def run(self, only=None, start=None, force=False):
+        """Synchronous entry point for run_async"""
+        return asyncio.run(self.run_async(only, start, force))
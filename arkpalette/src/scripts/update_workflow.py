@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Complete workflow script that:
+1. Crawls new images from the website
+2. Processes them and updates operators_1.json
+3. Provides status reporting
+
+Stages run as an asyncio task graph: independent stages run concurrently and
+stages whose outputs are newer than their inputs are skipped.
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add the scripts directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from update_crawl import ImageCrawler
+from process_images import ImageProcessor
+from crawl_status import check_crawl_status
+from task_graph import Stage, TaskGraph
+from sharding import parse_shard
+
+def crawl_stage():
+    """Crawl new images (the crawler starts Chrome, so it is created lazily)"""
+    crawler = ImageCrawler()
+    crawler.crawl_new_images()
+
+# Stages that do not need an ImageProcessor (and its store and catalog)
+WORKFLOW_STAGES = {"crawl", "status"}
+
+def needs_processing(only=None, start=None):
+    """Whether the --only / --from selection includes any processing stage"""
+    if only:
+        return not set(only) <= WORKFLOW_STAGES
+    return start != "status"
+
+def build_workflow_graph(cleanup=True, only=None, start=None):
+    """Build the crawl → process graph; status only needs the crawl"""
+    graph = TaskGraph()
+    graph.add(Stage("crawl", crawl_stage))
+    if needs_processing(only, start):
+        processor = ImageProcessor()
+        processor.build_graph(graph, after=["crawl"], cleanup=cleanup)
+    graph.add(Stage("status", check_crawl_status, after=["crawl"]))
+    return graph
+
+def run_complete_workflow(only=None, start=None, force=False, cleanup=True):
+    """Run the complete workflow: crawl + process + status"""
+    print("=" * 60)
+    print("🚀 ARK PALETTE UPDATE WORKFLOW")
+    print("=" * 60)
+    
+    start_time = datetime.now()
+    
+    try:
+        graph = build_workflow_graph(cleanup=cleanup, only=only, start=start)
+        print(f"📋 Stages: {', '.join(name for name in graph.stages if name in graph.select(only, start))}")
+        graph.run(only=only, start=start, force=force)
+    except Exception as e:
+        print(f"❌ Error during workflow: {e}")
+        return False
+    
+    end_time = datetime.now()
+    duration = end_time - start_time
+    
+    print("\n" + "=" * 60)
+    print(f"🎉 WORKFLOW COMPLETED SUCCESSFULLY!")
+    print(f"⏱️  Total time: {duration}")
+    print("=" * 60)
+    
+    return True
+
+def show_help():
+    """Show help information"""
+    print("ARK Palette Update Workflow")
+    print("=" * 40)
+    print("Usage:")
+    print("  python update_workflow.py run     - Run complete workflow")
+    print("  python update_workflow.py status  - Check current status")
+    print("  python update_workflow.py crawl   - Only crawl new images")
+    print("  python update_workflow.py process - Only process images")
+    print("  python update_workflow.py merge   - Merge partial shard results")
+    print("  python update_workflow.py help    - Show this help")
+    print("")
+    print("Options for run/process:")
+    print("  --only a,b      - Run only the named stages")
+    print("  --from stage    - Run the named stage and everything after it")
+    print("  --force         - Run stages even if their outputs are up to date")
+    print("  --no-cleanup    - Keep temporary folders (enables up-to-date skipping)")
+    print("  --shard i/N     - (process) Only process shard i of N and write a partial result")
+    print("")
+    print("Options for merge:")
+    print("  --allow-partial - Merge even if some shards are missing")
+    print("")
+    print("Stages: crawl, rename, crop, correct, pixelate, unicode, colors, palette, save, atlas, similarity, cleanup, status")
+
+def run_crawl_only():
+    """Run only the crawling step"""
+    print("📥 Crawling new images only...")
+    crawler = ImageCrawler()
+    crawler.crawl_new_images()
+
+def run_process_only(only=None, start=None, force=False, cleanup=True, shard=None):
+    """Run only the processing step"""
+    print("🔄 Processing images only...")
+    processor = ImageProcessor(shard=shard)
+    try:
+        processor.process_all(cleanup=cleanup, only=only, start=start, force=force)
+    except ValueError as e:
+        # Unknown --only/--from stages, or crawl/status, which process does not have
+        print(f"❌ Error during processing: {e}")
+        return False
+    return True
+
+def run_merge(partials=None, allow_partial=False):
+    """Merge partial shard results into operators_1.json"""
+    print("🧩 Merging shard results...")
+    processor = ImageProcessor()
+    try:
+        processor.merge_shards(partials, allow_partial=allow_partial)
+    except ValueError as e:
+        print(f"❌ Error merging: {e}")
+        return False
+    return True
+
+def parse_args(argv):
+    """Parse the command and stage selection options"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("partials", nargs="*")
+    parser.add_argument("--only", type=lambda value: [name.strip() for name in value.split(",") if name.strip()])
+    parser.add_argument("--from", dest="start")
+    parser.add_argument("--force", action="store_true")
+    parser.add_argument("--no-cleanup", dest="cleanup", action="store_false")
+    parser.add_argument("--shard", type=parse_shard)
+    parser.add_argument("--allow-partial", action="store_true")
+    return parser.parse_args(argv)
+
+def main():
+    """Main function"""
+    args = parse_args(sys.argv[1:])
+    if not args.command:
+        show_help()
+        return
+    
+    command = args.command.lower()
+    options = dict(only=args.only, start=args.start, force=args.force, cleanup=args.cleanup)
+    
+    if args.shard and command != "process":
+        # A sharded run writes a partial result, which only makes sense for process
+        print(f"❌ --shard is only supported by the process command, not {command}")
+        sys.exit(2)
+    
+    if command == "run":
+        success = run_complete_workflow(**options)
+        if not success:
+            sys.exit(1)
+    elif command == "status":
+        check_crawl_status()
+    elif command == "crawl":
+        run_crawl_only()
+    elif command == "process":
+        if not run_process_only(shard=args.shard, **options):
+            sys.exit(1)
+    elif command == "merge":
+        if not run_merge(args.partials, args.allow_partial):
+            sys.exit(1)
+    elif command == "help":
+        show_help()
+    else:
+        print(f"Unknown command: {command}")
+        show_help()
+
+if __name__ == "__main__":
+    main()